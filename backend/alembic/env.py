@@ -1,22 +1,27 @@
 import os
 from logging.config import fileConfig
 
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import create_engine, pool, text
 
 from alembic import context
+from app.core.config import settings
 from app.core.database import Base
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
-# Interpret the config file for Python logging.
-if config.config_file_name:
+# Interpret the config file for Python logging (skipped when migrations run inside the app).
+if config.config_file_name and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
 # Add your model's MetaData object here for 'autogenerate' support
 target_metadata = Base.metadata
 
+# Postgres advisory lock key held for the whole upgrade, so concurrent runners (several app
+# workers with MIGRATION_MODE=async, or several containers) apply migrations one at a time
+MIGRATION_LOCK_ID = 0x616C676F  # "algo"
+
 
 def get_url() -> str:
     # Prefer DATABASE_URL env var; otherwise use the url from alembic.ini
@@ -40,19 +45,31 @@ def run_migrations_offline():
 
 
 def run_migrations_online():
-    config_section = config.get_section(config.config_ini_section)
-    config_section["sqlalchemy.url"] = get_url()
-    connectable = engine_from_config(
-        config_section,
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
+    # NullPool: migrations use one short-lived connection and must not share the app's pool
+    connectable = create_engine(get_url(), poolclass=pool.NullPool)
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
-
-        with context.begin_transaction():
-            context.run_migrations()
+        is_postgres = connection.dialect.name == "postgresql"
+        if is_postgres:
+            # Taken before lock_timeout is set: later runners wait for the first to finish,
+            # then find the database at head and do nothing
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_ID})
+            # Session-level, so it also covers statements run in autocommit blocks
+            connection.execute(
+                text("SELECT set_config('lock_timeout', :timeout, false)"),
+                {"timeout": settings.migration_lock_timeout},
+            )
+            connection.commit()
+        try:
+            context.configure(connection=connection, target_metadata=target_metadata)
+
+            with context.begin_transaction():
+                context.run_migrations()
+        finally:
+            if is_postgres:
+                connection.rollback()
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_ID})
+                connection.commit()
 
 
 if context.is_offline_mode():
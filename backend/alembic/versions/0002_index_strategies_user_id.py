@@ -0,0 +1,25 @@
+"""index strategies.user_id
+
+Revision ID: 0002_strategies_user_id_index
+Revises: 0001_initial
+Create Date: 2026-10-15 00:00:00.000000
+"""
+
+from alembic import op
+
+revision = "0002_strategies_user_id_index"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY avoids locking `strategies` against writes while the index builds;
+    # Postgres refuses it inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        op.create_index("ix_strategies_user_id", "strategies", ["user_id"], postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_strategies_user_id", table_name="strategies", postgresql_concurrently=True)
@@ -0,0 +1,32 @@
+"""index strategies.status, (user_id, status) and symbol
+
+Revision ID: 0003_strategies_status_indexes
+Revises: 0002_strategies_user_id_index
+Create Date: 2026-10-15 00:00:00.000000
+"""
+
+from alembic import op
+
+revision = "0003_strategies_status_indexes"
+down_revision = "0002_strategies_user_id_index"
+branch_labels = None
+depends_on = None
+
+_INDEXES = (
+    ("ix_strategies_status", ["status"]),
+    ("ix_strategies_user_status", ["user_id", "status"]),
+    ("ix_strategies_symbol", ["symbol"]),
+)
+
+
+def upgrade() -> None:
+    # Built CONCURRENTLY (outside a transaction) so `strategies` stays writable, as in 0002
+    with op.get_context().autocommit_block():
+        for name, columns in _INDEXES:
+            op.create_index(name, "strategies", columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(_INDEXES):
+            op.drop_index(name, table_name="strategies", postgresql_concurrently=True)
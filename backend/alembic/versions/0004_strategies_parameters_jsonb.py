@@ -0,0 +1,53 @@
+"""store strategies.parameters as JSONB with a GIN index
+
+Revision ID: 0004_strategies_parameters_jsonb
+Revises: 0003_strategies_status_indexes
+Create Date: 2026-10-15 00:00:00.000000
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision = "0004_strategies_parameters_jsonb"
+down_revision = "0003_strategies_status_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # JSONB is Postgres-only; other backends keep the generic JSON column
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.alter_column(
+        "strategies",
+        "parameters",
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=False,
+        postgresql_using="parameters::jsonb",
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_strategies_params_gin",
+            "strategies",
+            ["parameters"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_strategies_params_gin", table_name="strategies", postgresql_concurrently=True)
+    op.alter_column(
+        "strategies",
+        "parameters",
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=False,
+        postgresql_using="parameters::json",
+    )
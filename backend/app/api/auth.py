@@ -1,12 +1,13 @@
 from datetime import timedelta
 from typing import Annotated
 
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr
 
-from app.core.config import settings
-from app.core.security import create_access_token, decode_token, get_password_hash, verify_password
+from app.core.config import Settings, get_settings
+from app.core.security import create_access_token, decode_token_cached, get_password_hash, verify_password
 
 router = APIRouter()
 
@@ -15,6 +16,9 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 # In-memory user store for demo (replace with database in production)
 fake_users_db: dict = {}
 
+# Resolved users keyed by email, so back-to-back authenticated requests skip the user lookup
+_user_cache: TTLCache = TTLCache(maxsize=5000, ttl=30)
+
 
 class UserCreate(BaseModel):
     email: EmailStr
@@ -49,7 +53,10 @@ async def register(user: UserCreate):
 
 
 @router.post("/login", response_model=Token)
-async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
+async def login(
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    settings: Annotated[Settings, Depends(get_settings)],
+):
     user = fake_users_db.get(form_data.username)
     if not user or not verify_password(form_data.password, user["hashed_password"]):
         raise HTTPException(
@@ -65,7 +72,7 @@ async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
 @router.get("/me", response_model=UserResponse)
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
 
-    payload = decode_token(token)
+    payload = decode_token_cached(token)
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -73,10 +80,15 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
             headers={"WWW-Authenticate": "Bearer"},
         )
     email = payload.get("sub")
+    cached_user = _user_cache.get(email)
+    if cached_user is not None:
+        return cached_user
     user = fake_users_db.get(email)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-    return UserResponse(email=user["email"], full_name=user["full_name"])
+    user_response = UserResponse(email=user["email"], full_name=user["full_name"])
+    _user_cache[email] = user_response
+    return user_response
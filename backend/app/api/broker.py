@@ -1,12 +1,84 @@
-from typing import List, Optional
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set
 
+from cachetools import LRUCache
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel
 
+from app.brokers import SUPPORTED_BROKERS, BrokerAdapter, get_broker_adapter
+from app.core.cache import CachePolicy
+from app.core.response_cache import cache_response
+
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
-# In-memory broker store for demo (replace with database in production)
-broker_connections: dict = {}
+# Upper bound on pooled adapters; the least recently used connection is evicted beyond it
+MAX_BROKER_CONNECTIONS = 10000
+
+# Evicted adapters waiting to be closed by `close_evicted_adapters` (set while it runs)
+_evicted_adapters: Optional[asyncio.Queue] = None
+
+
+# Fallback close tasks, referenced until done so they can't be garbage collected mid-close
+_closing_tasks: Set[asyncio.Task] = set()
+
+
+def _close_without_consumer(adapter: BrokerAdapter) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No event loop in this thread (pool used from sync code): close right here
+        try:
+            asyncio.run(adapter.aclose())
+        except Exception:
+            logger.exception("Failed to close evicted %s adapter", adapter.broker_name)
+        return
+    task = loop.create_task(adapter.aclose())
+    _closing_tasks.add(task)
+    task.add_done_callback(_on_close_done)
+
+
+def _on_close_done(task: asyncio.Task) -> None:
+    _closing_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Failed to close evicted adapter", exc_info=task.exception())
+
+
+class AdapterPool(LRUCache):
+    """LRU cache of connected adapters whose evictions are handed off for closing."""
+
+    def popitem(self):
+        user_id, adapter = super().popitem()
+        if _evicted_adapters is not None:
+            _evicted_adapters.put_nowait(adapter)
+        else:
+            # No consumer running (app used without its lifespan)
+            _close_without_consumer(adapter)
+        return user_id, adapter
+
+
+async def close_evicted_adapters() -> None:
+    """Close adapters evicted from the pool; runs for the lifetime of the app."""
+    global _evicted_adapters
+    queue = _evicted_adapters = asyncio.Queue()
+    try:
+        while True:
+            adapter = await queue.get()
+            try:
+                await adapter.aclose()
+            except Exception:
+                logger.exception("Failed to close evicted %s adapter", adapter.broker_name)
+            finally:
+                queue.task_done()
+    finally:
+        _evicted_adapters = None
+
+
+# Connected broker adapters keyed by user id, reused across requests so that login,
+# session generation and TLS setup happen once per user rather than once per call
+broker_connections: AdapterPool = AdapterPool(maxsize=MAX_BROKER_CONNECTIONS)
 
 
 class BrokerConfig(BaseModel):
@@ -14,6 +86,11 @@ class BrokerConfig(BaseModel):
     api_key: str
     api_secret: str
     user_id: str
+    # Broker-specific credentials (Dhan/Fyers: client_id + access_token, Angel One: client_id + password + totp_key)
+    client_id: Optional[str] = None
+    access_token: Optional[str] = None
+    password: Optional[str] = None
+    totp_key: Optional[str] = None
 
 
 class BrokerResponse(BaseModel):
@@ -28,18 +105,48 @@ class BrokerStatus(BaseModel):
     message: Optional[str] = None
 
 
+class BrokerPortfolio(BaseModel):
+    broker_name: str
+    positions: List[Dict[str, Any]]
+    holdings: List[Dict[str, Any]]
+
+
 @router.post("/connect", response_model=BrokerResponse)
 async def connect_broker(config: BrokerConfig):
     """Connect to a trading broker with provided credentials."""
-    # In production, this would validate credentials with the actual broker API
-    broker_connections[config.user_id] = {
-        "broker_name": config.broker_name,
-        "api_key": config.api_key,
-        "api_secret": config.api_secret,
-        "is_connected": True,
-    }
+    try:
+        adapter = get_broker_adapter(config.broker_name)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+    try:
+        connected = await adapter.connect(config.model_dump(exclude_none=True))
+    except Exception as exc:
+        logger.warning("Connecting to %s failed", config.broker_name, exc_info=True)
+        await adapter.aclose()
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Could not reach the broker",
+        ) from exc
+    if not connected:
+        await adapter.aclose()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Broker rejected the supplied credentials",
+        )
+
+    # Swap in the new adapter before awaiting anything, so concurrent connects for the same
+    # user each close exactly the adapter they replaced
+    previous = broker_connections.pop(config.user_id, None)
+    broker_connections[config.user_id] = adapter
+    if previous is not None:
+        await previous.aclose()
+
     return BrokerResponse(
-        broker_name=config.broker_name,
+        broker_name=adapter.broker_name,
         user_id=config.user_id,
         is_connected=True,
     )
@@ -53,10 +160,10 @@ async def disconnect_broker(user_id: str):
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No broker connection found for this user",
         )
-    broker_name = broker_connections[user_id]["broker_name"]
-    del broker_connections[user_id]
+    adapter = broker_connections.pop(user_id)
+    await adapter.aclose()
     return BrokerStatus(
-        broker_name=broker_name,
+        broker_name=adapter.broker_name,
         status="disconnected",
         message="Successfully disconnected from broker",
     )
@@ -65,21 +172,41 @@ async def disconnect_broker(user_id: str):
 @router.get("/status/{user_id}", response_model=BrokerStatus)
 async def get_broker_status(user_id: str):
     """Get the current broker connection status."""
-    if user_id not in broker_connections:
+    adapter = broker_connections.get(user_id)
+    if adapter is None:
         return BrokerStatus(
             broker_name="none",
             status="not_connected",
             message="No broker connection found",
         )
-    connection = broker_connections[user_id]
     return BrokerStatus(
-        broker_name=connection["broker_name"],
-        status="connected" if connection["is_connected"] else "disconnected",
+        broker_name=adapter.broker_name,
+        status="connected",
         message="Broker is connected and ready",
     )
 
 
+@router.get("/portfolio/{user_id}", response_model=BrokerPortfolio)
+@cache_response(CachePolicy.SHORT)
+async def get_broker_portfolio(user_id: str):
+    """Get positions and holdings from the user's connected broker."""
+    adapter = broker_connections.get(user_id)
+    if adapter is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No broker connection found for this user",
+        )
+    # Issued concurrently; on a shared HTTP/2 client both requests multiplex over one connection
+    positions, holdings = await asyncio.gather(adapter.get_positions(), adapter.get_holdings())
+    return BrokerPortfolio(
+        broker_name=adapter.broker_name,
+        positions=positions,
+        holdings=holdings,
+    )
+
+
 @router.get("/supported", response_model=List[str])
 async def get_supported_brokers():
     """Get list of supported brokers."""
-    return ["zerodha", "upstox", "angelone", "fyers", "iifl"]
+    # Returned as-is; FastAPI serializes the tuple as a JSON array
+    return SUPPORTED_BROKERS
@@ -1,14 +1,31 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, ConfigDict
-from sqlalchemy.orm import Session
-
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache_generation, cache_get, cache_invalidate, cache_set
+from app.core.config import Settings, get_settings
 from app.core.database import get_db
 from app.models.strategy import Strategy as StrategyModel, StrategyStatus, StrategyType
 
 router = APIRouter()
 
+# Short-lived snapshots of single strategies keyed by id; writes through this router invalidate them.
+# Handlers all run on the event loop, so no locking is needed.
+_strategy_cache: TTLCache = TTLCache(maxsize=5000, ttl=5)
+
+
+# Redis namespace for cached GET /strategies/ pages; every write moves it to a new generation
+STRATEGY_LIST_CACHE = "strategies"
+
+
+async def _invalidate_strategy(strategy_id: int) -> None:
+    _strategy_cache.pop(strategy_id, None)
+    await cache_invalidate(STRATEGY_LIST_CACHE)
+
 
 # Reuse StrategyType and StrategyStatus from `app.models.strategy` to ensure consistent enums across model & API.
 
@@ -36,11 +53,25 @@ class StrategyResponse(BaseModel):
     status: StrategyStatus
     user_id: int
 
-    model_config = ConfigDict(from_attributes=True)
+    # Values come straight from the ORM with the right types, so skip lax coercion.
+    # Enum fields stay members (strict mode only accepts members); JSON output uses their values
+    model_config = ConfigDict(from_attributes=True, strict=True, frozen=True)
+
+
+class StrategySummary(BaseModel):
+    id: int
+    name: str
+    status: StrategyStatus
+
+    model_config = ConfigDict(from_attributes=True, strict=True, frozen=True)
+
+
+_strategy_list_adapter = TypeAdapter(List[StrategyResponse])
+_strategy_summary_adapter = TypeAdapter(List[StrategySummary])
 
 
 @router.post("/", response_model=StrategyResponse)
-def create_strategy(strategy: StrategyCreate, db: Session = Depends(get_db)):
+async def create_strategy(strategy: StrategyCreate, db: AsyncSession = Depends(get_db)):
     """Create a new trading strategy and persist to the database."""
     db_strategy = StrategyModel(
         name=strategy.name,
@@ -51,37 +82,80 @@ def create_strategy(strategy: StrategyCreate, db: Session = Depends(get_db)):
         user_id=strategy.user_id,
     )
     db.add(db_strategy)
-    db.commit()
-    db.refresh(db_strategy)
-    return StrategyResponse.from_orm(db_strategy)
+    await db.commit()
+    await db.refresh(db_strategy)
+    await cache_invalidate(STRATEGY_LIST_CACHE)
+    return db_strategy
 
 
 @router.get("/", response_model=List[StrategyResponse])
-def list_strategies(user_id: Optional[int] = None, db: Session = Depends(get_db)):
-    """List all strategies, optionally filtered by user."""
-    query = db.query(StrategyModel)
+async def list_strategies(
+    user_id: Optional[int] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+    settings: Settings = Depends(get_settings),
+):
+    """List strategies page by page, optionally filtered by user."""
+    ttl = settings.strategy_list_cache_ttl
+    generation = await cache_generation(STRATEGY_LIST_CACHE) if ttl else None
+    cache_key = f"{generation}:{user_id}:{skip}:{limit}"
+    if generation is not None:
+        cached = await cache_get(STRATEGY_LIST_CACHE, cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+
+    query = select(StrategyModel).order_by(StrategyModel.id)
+    if user_id:
+        query = query.where(StrategyModel.user_id == user_id)
+    strategies = (await db.scalars(query.offset(skip).limit(limit))).all()
+
+    # Serialize once to bytes so the same payload can be cached and returned as-is
+    body = _strategy_list_adapter.dump_json(_strategy_list_adapter.validate_python(strategies, from_attributes=True))
+    if generation is not None:
+        await cache_set(STRATEGY_LIST_CACHE, cache_key, body, ttl)
+    return Response(content=body, media_type="application/json")
+
+
+# Declared before /{strategy_id} so "summary" isn't parsed as an id
+@router.get("/summary", response_model=List[StrategySummary])
+async def list_strategy_summaries(
+    user_id: Optional[int] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+):
+    """List id, name and status of strategies, for list views that don't need parameters."""
+    # Selecting only these columns skips loading and decoding the parameters JSON
+    query = select(StrategyModel.id, StrategyModel.name, StrategyModel.status).order_by(StrategyModel.id)
     if user_id:
-        query = query.filter(StrategyModel.user_id == user_id)
-    strategies = query.all()
-    return [StrategyResponse.from_orm(s) for s in strategies]
+        query = query.where(StrategyModel.user_id == user_id)
+    rows = (await db.execute(query.offset(skip).limit(limit))).all()
+    body = _strategy_summary_adapter.dump_json(_strategy_summary_adapter.validate_python(rows, from_attributes=True))
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{strategy_id}", response_model=StrategyResponse)
-def get_strategy(strategy_id: int, db: Session = Depends(get_db)):
+async def get_strategy(strategy_id: int, db: AsyncSession = Depends(get_db)):
     """Get a specific strategy by ID."""
-    strategy = db.get(StrategyModel, strategy_id)
+    cached = _strategy_cache.get(strategy_id)
+    if cached is not None:
+        return cached
+    strategy = await db.get(StrategyModel, strategy_id)
     if not strategy:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Strategy not found",
         )
-    return StrategyResponse.from_orm(strategy)
+    response = StrategyResponse.model_validate(strategy)
+    _strategy_cache[strategy_id] = response
+    return response
 
 
 @router.patch("/{strategy_id}", response_model=StrategyResponse)
-def update_strategy(strategy_id: int, update: StrategyUpdate, db: Session = Depends(get_db)):
+async def update_strategy(strategy_id: int, update: StrategyUpdate, db: AsyncSession = Depends(get_db)):
     """Update a strategy."""
-    strategy = db.get(StrategyModel, strategy_id)
+    strategy = await db.get(StrategyModel, strategy_id)
     if not strategy:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -93,50 +167,51 @@ def update_strategy(strategy_id: int, update: StrategyUpdate, db: Session = Depe
         strategy.parameters = update.parameters
     if update.status is not None:
         strategy.status = update.status
-    db.commit()
-    db.refresh(strategy)
-    return StrategyResponse.from_orm(strategy)
+    await db.commit()
+    await _invalidate_strategy(strategy_id)
+    return strategy
 
 
 @router.delete("/{strategy_id}")
-def delete_strategy(strategy_id: int, db: Session = Depends(get_db)):
+async def delete_strategy(strategy_id: int, db: AsyncSession = Depends(get_db)):
     """Delete a strategy."""
-    strategy = db.get(StrategyModel, strategy_id)
+    strategy = await db.get(StrategyModel, strategy_id)
     if not strategy:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Strategy not found",
         )
-    db.delete(strategy)
-    db.commit()
+    await db.delete(strategy)
+    await db.commit()
+    await _invalidate_strategy(strategy_id)
     return {"message": "Strategy deleted successfully"}
 
 
 @router.post("/{strategy_id}/start", response_model=StrategyResponse)
-def start_strategy(strategy_id: int, db: Session = Depends(get_db)):
+async def start_strategy(strategy_id: int, db: AsyncSession = Depends(get_db)):
     """Start a strategy (activate for execution)."""
-    strategy = db.get(StrategyModel, strategy_id)
+    strategy = await db.get(StrategyModel, strategy_id)
     if not strategy:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Strategy not found",
         )
     strategy.status = StrategyStatus.ACTIVE
-    db.commit()
-    db.refresh(strategy)
-    return StrategyResponse.from_orm(strategy)
+    await db.commit()
+    await _invalidate_strategy(strategy_id)
+    return strategy
 
 
 @router.post("/{strategy_id}/stop", response_model=StrategyResponse)
-def stop_strategy(strategy_id: int, db: Session = Depends(get_db)):
+async def stop_strategy(strategy_id: int, db: AsyncSession = Depends(get_db)):
     """Stop a running strategy."""
-    strategy = db.get(StrategyModel, strategy_id)
+    strategy = await db.get(StrategyModel, strategy_id)
     if not strategy:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Strategy not found",
         )
     strategy.status = StrategyStatus.STOPPED
-    db.commit()
-    db.refresh(strategy)
-    return StrategyResponse.from_orm(strategy)
+    await db.commit()
+    await _invalidate_strategy(strategy_id)
+    return strategy
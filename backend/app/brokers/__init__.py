@@ -1,20 +1,34 @@
+import sys
+from typing import Dict, Tuple, Type
+
 from .angel_one import AngelOneBroker
 from .base import BrokerAdapter
 from .dhan import DhanBroker
 from .fyers import FyersBroker
 
+# Broker name (lower-case, interned) -> adapter class, built once at import
+_BROKER_REGISTRY: Dict[str, Type[BrokerAdapter]] = {
+    sys.intern(name): adapter_cls
+    for name, adapter_cls in {
+        "dhan": DhanBroker,
+        "angelone": AngelOneBroker,
+        "fyers": FyersBroker,
+    }.items()
+}
+
+# Served by /broker/supported; derived from the registry so the two can't drift
+SUPPORTED_BROKERS: Tuple[str, ...] = tuple(_BROKER_REGISTRY)
+
 
 def get_broker_adapter(broker_name: str) -> BrokerAdapter:
     """
     Factory function to get the appropriate broker adapter.
     """
-    if broker_name.lower() == "dhan":
-        return DhanBroker()
-    if broker_name.lower() == "angelone":
-        return AngelOneBroker()
-    if broker_name.lower() == "fyers":
-        return FyersBroker()
-    raise ValueError(f"Unsupported broker: {broker_name}")
+    key = broker_name.lower()
+    adapter_cls = _BROKER_REGISTRY.get(key)
+    if adapter_cls is None:
+        raise ValueError(f"Unsupported broker: {broker_name}")
+    return adapter_cls()
 
 
-__all__ = ["BrokerAdapter", "DhanBroker", "AngelOneBroker", "FyersBroker", "get_broker_adapter"]
+__all__ = ["BrokerAdapter", "DhanBroker", "AngelOneBroker", "FyersBroker", "SUPPORTED_BROKERS", "get_broker_adapter"]
@@ -1,12 +1,35 @@
+import asyncio
+import hashlib
+import time
 from typing import Any, Dict, List, Optional
 
 import pyotp
+from cachetools import TTLCache
 from SmartApi import SmartConnect
 
 from .base import BrokerAdapter
 
+# Parsed TOTP generator per secret plus the code last generated with its 30s time step,
+# so reconnect storms reuse the code for the current window. Keyed by a hash of the seed,
+# bounded, and expired so seeds of users who stopped connecting don't linger in memory.
+_totp_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
+
+def _current_totp(totp_key: str) -> str:
+    cache_key = hashlib.sha256(totp_key.encode()).hexdigest()
+    entry = _totp_cache.get(cache_key)
+    totp_obj = entry[0] if entry is not None else pyotp.TOTP(totp_key)
+    step = int(time.time() // totp_obj.interval)
+    if entry is not None and entry[1] == step:
+        return entry[2]
+    totp = totp_obj.generate_otp(step)
+    _totp_cache[cache_key] = (totp_obj, step, totp)
+    return totp
+
 
 class AngelOneBroker(BrokerAdapter):
+    broker_name = "angelone"
+
     def __init__(self):
         self.smart_api: Optional[SmartConnect] = None
         self.client_code: Optional[str] = None
@@ -20,18 +43,13 @@ class AngelOneBroker(BrokerAdapter):
 
         self.smart_api = SmartConnect(api_key=api_key)
 
-        if totp_key:
-            try:
-                totp = pyotp.TOTP(totp_key).now()
-            except Exception:
-                totp = credentials.get("totp", "000000")
-        else:
+        try:
+            totp = _current_totp(totp_key) if totp_key else credentials.get("totp", "000000")
+        except Exception:
             totp = credentials.get("totp", "000000")
 
-        # Note: generateSession is synchronous in the library usually,
-        # but we are in an async method. It might block the loop briefly.
-        # For production, run in executor.
-        data = self.smart_api.generateSession(self.client_code, password, totp)
+        # SmartConnect is synchronous; run its HTTP calls off the event loop
+        data = await asyncio.to_thread(self.smart_api.generateSession, self.client_code, password, totp)
 
         if isinstance(data, dict):
             if data.get("status") is False:
@@ -44,7 +62,7 @@ class AngelOneBroker(BrokerAdapter):
 
     async def get_profile(self) -> Dict[str, Any]:
         if self.smart_api and self.refresh_token:
-            return self.smart_api.getProfile(self.refresh_token)
+            return await asyncio.to_thread(self.smart_api.getProfile, self.refresh_token)
         return {}
 
     async def place_order(self, order_details: Dict[str, Any]) -> Dict[str, Any]:
@@ -65,14 +83,14 @@ class AngelOneBroker(BrokerAdapter):
             "stoploss": "0",
             "quantity": order_details.get("quantity"),
         }
-        order_id = self.smart_api.placeOrder(orderparams)
+        order_id = await asyncio.to_thread(self.smart_api.placeOrder, orderparams)
         return {"order_id": order_id}
 
     async def cancel_order(self, order_id: str) -> bool:
         if not self.smart_api:
             return False
         try:
-            self.smart_api.cancelOrder(order_id, "NORMAL")
+            await asyncio.to_thread(self.smart_api.cancelOrder, order_id, "NORMAL")
             return True
         except Exception:
             return False
@@ -80,7 +98,7 @@ class AngelOneBroker(BrokerAdapter):
     async def get_order_status(self, order_id: str) -> Dict[str, Any]:
         if not self.smart_api:
             return {}
-        order_book = self.smart_api.orderBook()
+        order_book = await asyncio.to_thread(self.smart_api.orderBook)
         if order_book and "data" in order_book:
             for order in order_book["data"]:
                 if order["orderid"] == order_id:
@@ -90,11 +108,11 @@ class AngelOneBroker(BrokerAdapter):
     async def get_positions(self) -> List[Dict[str, Any]]:
         if not self.smart_api:
             return []
-        resp = self.smart_api.position()
+        resp = await asyncio.to_thread(self.smart_api.position)
         return resp.get("data", [])
 
     async def get_holdings(self) -> List[Dict[str, Any]]:
         if not self.smart_api:
             return []
-        resp = self.smart_api.holding()
+        resp = await asyncio.to_thread(self.smart_api.holding)
         return resp.get("data", [])
@@ -1,5 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Union
 
 
 class BrokerAdapter(ABC):
@@ -7,6 +8,10 @@ class BrokerAdapter(ABC):
     Abstract base class for all broker adapters.
     """
 
+    broker_name: str = ""
+    # Upper bound on in-flight requests from one place_orders batch (broker rate limits)
+    max_concurrent_orders: int = 10
+
     @abstractmethod
     async def connect(self, credentials: Dict[str, Any]) -> bool:
         """
@@ -35,6 +40,20 @@ class BrokerAdapter(ABC):
         """
         raise NotImplementedError()
 
+    async def place_orders(self, orders: List[Dict[str, Any]]) -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        Place several orders concurrently, so a batch costs about one round-trip of wall time.
+        Results come back in input order; a failed order yields its exception instead of
+        aborting the rest of the batch.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_orders)
+
+        async def place(order_details: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.place_order(order_details)
+
+        return await asyncio.gather(*(place(order) for order in orders), return_exceptions=True)
+
     @abstractmethod
     async def cancel_order(self, order_id: str) -> bool:
         """
@@ -62,3 +81,10 @@ class BrokerAdapter(ABC):
         Get current holdings.
         """
         raise NotImplementedError()
+
+    async def aclose(self) -> None:
+        """
+        Release any network resources held by the adapter.
+        Adapters without persistent connections can rely on this no-op.
+        """
+        return None
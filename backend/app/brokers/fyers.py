@@ -1,14 +1,98 @@
+import asyncio
+from contextvars import ContextVar
+from http.cookiejar import DefaultCookiePolicy
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional
 
+import requests
 from fyers_apiv3 import fyersModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.core.cache import CachePolicy, cached
 
 from .base import BrokerAdapter
 
+# Fyers order type codes: 1 => Limit, 2 => Market, 3 => Stop Limit, 4 => Stop Market
+_ORDER_TYPE_MAP = MappingProxyType({"LIMIT": 1, "MARKET": 2, "STOP_LIMIT": 3, "STOP_MARKET": 4})
+
+# Fyers side codes: 1 => Buy, -1 => Sell
+_SIDE_MAP = MappingProxyType({"BUY": 1, "SELL": -1})
+
+# Order fields that never vary per order
+_ORDER_TEMPLATE = MappingProxyType({"stopPrice": 0, "validity": "DAY", "disclosedQty": 0, "offlineOrder": False})
+
+
+# HTTP session of the adapter whose SDK call is running. Set around each to_thread call;
+# to_thread copies the context, so the worker thread sees its own adapter's session.
+_current_session: ContextVar[Optional[requests.Session]] = ContextVar("fyers_http_session", default=None)
+
+
+class _PooledRequests:
+    """
+    Stand-in for the `requests` module inside fyersModel.
+    fyers-apiv3 calls requests.get/post/delete/patch directly, which opens a new
+    TCP + TLS connection per call; routing them through the calling adapter's Session
+    keeps its connections alive. Outside an adapter call the real module is used.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        # Exceptions (requests.HTTPError, ...) and anything else come from the real module
+        return getattr(requests, name)
+
+    @staticmethod
+    def _target() -> Any:
+        return _current_session.get() or requests
+
+    def get(self, *args, **kwargs) -> requests.Response:
+        return self._target().get(*args, **kwargs)
+
+    def post(self, *args, **kwargs) -> requests.Response:
+        return self._target().post(*args, **kwargs)
+
+    def delete(self, *args, **kwargs) -> requests.Response:
+        return self._target().delete(*args, **kwargs)
+
+    def patch(self, *args, **kwargs) -> requests.Response:
+        return self._target().patch(*args, **kwargs)
+
+
+def _build_http_session() -> requests.Session:
+    session = requests.Session()
+    # Fyers authenticates with a header; refuse cookies so no server state rides along between calls
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    # Retry only covers connection failures for POST/PATCH (urllib3 never re-sends non-idempotent requests)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=10, max_retries=Retry(total=2, backoff_factor=0.1))
+    session.mount("https://", adapter)
+    return session
+
+
+fyersModel.requests = _PooledRequests()
+
+
+def _account_scope(broker: "FyersBroker") -> str:
+    return f"fyers:{broker.client_id}"
+
 
 class FyersBroker(BrokerAdapter):
+    broker_name = "fyers"
+
     def __init__(self):
         self.fyers: Optional[fyersModel.FyersModel] = None
         self.client_id: Optional[str] = None
+        # Keep-alive connections for this account only; closed in aclose()
+        self._http = _build_http_session()
+
+    async def _call(self, func, *args) -> Any:
+        """Run a blocking fyersModel call in a worker thread over this adapter's session."""
+        token = _current_session.set(self._http)
+        try:
+            return await asyncio.to_thread(func, *args)
+        finally:
+            _current_session.reset(token)
+
+    async def aclose(self) -> None:
+        self._http.close()
 
     async def connect(self, credentials: Dict[str, Any]) -> bool:
         self.client_id = credentials.get("client_id")
@@ -18,76 +102,74 @@ class FyersBroker(BrokerAdapter):
         self.fyers = fyersModel.FyersModel(client_id=self.client_id, token=access_token, log_path="")
 
         # Verify connection by fetching profile
-        # Note: fyersModel methods are synchronous.
+        # fyersModel methods are synchronous, so every call runs in a worker thread
         try:
-            response = self.fyers.get_profile()
+            response = await self._call(self.fyers.get_profile)
             if response.get("s") == "ok":
                 return True
         except Exception:
             pass
         return False
 
+    @cached(CachePolicy.LONG, scope=_account_scope)
     async def get_profile(self) -> Dict[str, Any]:
         if self.fyers:
-            return self.fyers.get_profile()
+            return await self._call(self.fyers.get_profile)
         return {}
 
     async def place_order(self, order_details: Dict[str, Any]) -> Dict[str, Any]:
         if not self.fyers:
             raise RuntimeError("Broker not connected")
 
-        # Map order types
-        # Fyers: 1 => Limit, 2 => Market, 3 => Stop Limit, 4 => Stop Market
-        order_type_map = {"LIMIT": 1, "MARKET": 2, "STOP_LIMIT": 3, "STOP_MARKET": 4}
-
-        # Map side
-        # Fyers: 1 => Buy, -1 => Sell
-        side_map = {"BUY": 1, "SELL": -1}
-
         data = {
+            **_ORDER_TEMPLATE,
             "symbol": order_details.get("symbol"),  # e.g. NSE:SBIN-EQ
             "qty": order_details.get("quantity"),
-            "type": order_type_map.get(order_details.get("order_type", "MARKET"), 2),
-            "side": side_map.get(order_details.get("side", "BUY"), 1),
+            "type": _ORDER_TYPE_MAP.get(order_details.get("order_type", "MARKET"), 2),
+            "side": _SIDE_MAP.get(order_details.get("side", "BUY"), 1),
             "productType": order_details.get("product_type", "INTRADAY"),
             "limitPrice": order_details.get("price", 0),
-            "stopPrice": 0,
-            "validity": "DAY",
-            "disclosedQty": 0,
-            "offlineOrder": False,
         }
-        response = self.fyers.place_order(data)
+        response = await self._call(self.fyers.place_order, data)
         return response
 
     async def cancel_order(self, order_id: str) -> bool:
         if not self.fyers:
             return False
         data = {"id": order_id}
-        response = self.fyers.cancel_order(data)
+        response = await self._call(self.fyers.cancel_order, data)
         return response.get("s") == "ok"
 
     async def get_order_status(self, order_id: str) -> Dict[str, Any]:
         if not self.fyers:
             return {}
-        response = self.fyers.orderbook()
-        if response.get("s") == "ok":
-            for order in response.get("orderBook", []):
-                if order["id"] == order_id:
-                    return order
-        return {}
+        # Concurrent status polls share one orderbook request (@cached is single flight)
+        orders = await self._fetch_orderbook_indexed()
+        return orders.get(order_id, {})
+
+    # No stale fallback: an order status that is out of date is worse than an error
+    @cached(1, scope=_account_scope, stale=False)
+    async def _fetch_orderbook_indexed(self) -> Dict[str, Dict[str, Any]]:
+        """Fetch the orderbook once and index it by order id."""
+        response = await self._call(self.fyers.orderbook)
+        if response.get("s") != "ok":
+            return {}
+        return {order["id"]: order for order in response.get("orderBook", [])}
 
+    @cached(CachePolicy.SHORT, scope=_account_scope)
     async def get_positions(self) -> List[Dict[str, Any]]:
         if not self.fyers:
             return []
-        response = self.fyers.positions()
+        response = await self._call(self.fyers.positions)
         if response.get("s") == "ok":
             return response.get("netPositions", [])
         return []
 
+    @cached(CachePolicy.NORMAL, scope=_account_scope)
     async def get_holdings(self) -> List[Dict[str, Any]]:
         if not self.fyers:
             return []
-        response = self.fyers.holdings()
+        response = await self._call(self.fyers.holdings)
         if response.get("s") == "ok":
             return response.get("holdings", [])
         return []
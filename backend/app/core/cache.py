@@ -0,0 +1,138 @@
+import asyncio
+import functools
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import orjson
+import redis
+import redis.asyncio
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Every cache key lives under this prefix so namespaces can be cleared without touching Celery's keys
+CACHE_PREFIX = "algo"
+
+# Shared async client. Short timeouts keep a Redis outage from stalling requests:
+# every operation below degrades to a cache miss instead of raising.
+async_redis_client = redis.asyncio.Redis.from_url(settings.redis_url, max_connections=50, socket_connect_timeout=0.25, socket_timeout=0.25)
+
+# How long the last good value of a cached read is kept for fallback when its source fails
+STALE_TTL = 15 * 60
+
+T = TypeVar("T")
+
+# Loads currently running for a cache key; concurrent misses await these instead of
+# calling the source again (single flight)
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+class CachePolicy:
+    """
+    TTL tiers (seconds) for cached reads.
+    SHORT suits fast-moving data (positions), NORMAL slow-moving data (holdings),
+    LONG near-static data (profile).
+    """
+
+    SHORT = 2
+    NORMAL = 30
+    LONG = 60
+
+
+def _key(namespace: str, key: str) -> str:
+    return f"{CACHE_PREFIX}:{namespace}:{key}"
+
+
+async def cache_get(namespace: str, key: str) -> Optional[bytes]:
+    return await _async_get(_key(namespace, key))
+
+
+async def cache_set(namespace: str, key: str, value: bytes, ttl: int) -> None:
+    await _async_set(_key(namespace, key), value, ttl)
+
+
+async def cache_generation(namespace: str) -> Optional[int]:
+    """
+    Current generation of a namespace. Callers put it in their keys, so bumping it with
+    cache_invalidate() orphans every older entry (they expire by TTL) without scanning.
+    None when Redis can't be read; skip caching then rather than risk a stale read.
+    """
+    try:
+        return int(await async_redis_client.get(_key(namespace, "gen")) or 0)
+    except redis.RedisError:
+        logger.warning("Cache generation read failed for namespace %s", namespace, exc_info=True)
+        return None
+
+
+async def cache_invalidate(namespace: str) -> None:
+    """Invalidate every cached entry in a namespace (after writes) by starting a new generation."""
+    try:
+        await async_redis_client.incr(_key(namespace, "gen"))
+    except redis.RedisError:
+        logger.warning("Cache invalidation failed for namespace %s", namespace, exc_info=True)
+
+
+async def _async_get(key: str) -> Optional[bytes]:
+    try:
+        return await async_redis_client.get(key)
+    except redis.RedisError:
+        logger.warning("Cache read failed for %s", key, exc_info=True)
+        return None
+
+
+async def _async_set(key: str, value: bytes, ttl: int) -> None:
+    try:
+        await async_redis_client.set(key, value, ex=ttl)
+    except redis.RedisError:
+        logger.warning("Cache write failed for %s", key, exc_info=True)
+
+
+def cached(ttl: int, scope: Callable[[Any], str], stale: bool = True) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Cache the JSON-serializable result of an async method in Redis for `ttl` seconds.
+    `scope(self)` identifies the account the call is made for and is part of the key, together
+    with the method name and arguments. Concurrent calls for the same key share one load.
+    Unless `stale` is False, the last good result is also kept for STALE_TTL and returned if the
+    wrapped call raises; pass stale=False for data that must never be served out of date.
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        async def load(self, key: str, stale_key: str, args, kwargs) -> T:
+            hit = await _async_get(key)
+            if hit is not None:
+                return orjson.loads(hit)
+            try:
+                result = await func(self, *args, **kwargs)
+            except Exception:
+                if not stale:
+                    raise
+                last_good = await _async_get(stale_key)
+                if last_good is None:
+                    raise
+                logger.warning("Serving stale cached result for %s", key, exc_info=True)
+                return orjson.loads(last_good)
+
+            payload = orjson.dumps(result)
+            await _async_set(key, payload, ttl)
+            if stale:
+                await _async_set(stale_key, payload, STALE_TTL)
+            return result
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs) -> T:
+            call = f"{func.__name__}:{hashlib.sha256(orjson.dumps([args, kwargs])).hexdigest()[:16]}" if args or kwargs else func.__name__
+            key = _key("calls", f"{scope(self)}:{call}")
+            stale_key = _key("stale", f"{scope(self)}:{call}")
+
+            inflight = _inflight.get(key)
+            if inflight is None:
+                inflight = _inflight[key] = asyncio.ensure_future(load(self, key, stale_key, args, kwargs))
+                inflight.add_done_callback(lambda _: _inflight.pop(key, None))
+            # Shielded so one caller being cancelled doesn't cancel the load for the others
+            return await asyncio.shield(inflight)
+
+        return wrapper
+
+    return decorator
@@ -1,10 +1,13 @@
 import os
-from typing import Optional
+from functools import cached_property, lru_cache
+from typing import List, Optional
 
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
+
     # Database
     postgres_host: str = "localhost"
     postgres_port: int = 5432
@@ -15,6 +18,15 @@ class Settings(BaseSettings):
     # Optional full database url (e.g. DATABASE_URL)
     database_url_env: Optional[str] = None
 
+    # Connection pool for the app engine, per process (Alembic keeps NullPool). Each Uvicorn
+    # worker holds up to db_pool_size + db_max_overflow connections, so the server needs
+    # WEB_CONCURRENCY * (db_pool_size + db_max_overflow) in total; keep that under max_connections.
+    db_pool_size: int = 5
+    db_max_overflow: int = 5
+    db_pool_recycle: int = 1800
+    # Server-side cap on any single app query (Postgres statement_timeout, milliseconds; 0 disables)
+    db_statement_timeout_ms: int = 5000
+
     # Redis
     redis_host: str = "localhost"
     redis_port: int = 6379
@@ -22,16 +34,32 @@ class Settings(BaseSettings):
     # Optional full redis url (e.g. REDIS_URL)
     redis_url_env: Optional[str] = None
 
+    # Seconds to cache GET /strategies/ pages in Redis (0 disables)
+    strategy_list_cache_ttl: int = 2
+
     # Security
     secret_key: str = "your-secret-key-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
 
+    # Allowed CORS origins, as a JSON list (CORS_ORIGINS='["https://app.example.com"]').
+    # "*" allows any origin without credentials; auth uses bearer tokens, not cookies.
+    cors_origins: List[str] = ["*"]
+
+    # Migrations: "sync" (applied by the entrypoint before start-up), "async" (applied in the
+    # background once the app is serving) or "skip"
+    migration_mode: str = "sync"
+    # Postgres lock_timeout for migration statements, so DDL fails fast instead of queueing behind traffic
+    migration_lock_timeout: str = "5s"
+
     # Broker
     broker_api_key: str = ""
     broker_api_secret: str = ""
+    # Worker threads for blocking broker SDK calls dispatched via asyncio.to_thread
+    broker_thread_pool_size: int = 32
 
-    @property
+    # URLs are resolved once per Settings instance; the environment is fixed after start-up
+    @cached_property
     def database_url(self) -> str:
         # Prefer a full DATABASE_URL if provided
         # If a DATABASE_URL env var was set, prefer that
@@ -47,7 +75,7 @@ class Settings(BaseSettings):
         db = self.postgres_db
         return f"postgresql://{user}:{pwd}@{host}:{port}/{db}"
 
-    @property
+    @cached_property
     def redis_url(self) -> str:
         # If REDIS_URL is provided, use it directly
         redis = os.getenv("REDIS_URL")
@@ -59,9 +87,11 @@ class Settings(BaseSettings):
             return f"redis://:{self.redis_password}@{self.redis_host}:" f"{self.redis_port}/0"
         return f"redis://{self.redis_host}:{self.redis_port}/0"
 
-    class Config:
-        env_file = ".env"
-        extra = "ignore"
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Process-wide Settings, parsed from the environment once; use as a FastAPI dependency."""
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
@@ -1,17 +1,64 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import orjson
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 
 from app.core.config import settings
 
-engine = create_engine(settings.database_url)
-session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Async drivers used by the app engine; Alembic keeps the sync URL (psycopg2)
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def to_async_url(url: str) -> URL:
+    """Point a sync database URL at its async driver (postgresql -> asyncpg, sqlite -> aiosqlite)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        return parsed
+    parsed = parsed.set(drivername=f"{backend}+{_ASYNC_DRIVERS[backend]}")
+    if backend == "postgresql":
+        # asyncpg takes `ssl` rather than libpq's `sslmode` and has no channel_binding option
+        query = dict(parsed.query)
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        query.pop("channel_binding", None)
+        parsed = parsed.set(query=query)
+    return parsed
+
+
+def _json_dumps(value) -> str:
+    # orjson returns bytes; the drivers expect the JSON text
+    return orjson.dumps(value).decode()
+
+
+def _engine_options(url: URL) -> dict:
+    # JSON/JSONB columns (strategies.parameters) are encoded and decoded with orjson
+    options = {"json_serializer": _json_dumps, "json_deserializer": orjson.loads}
+    # SQLite (tests/local) manages its own pooling; only server databases get a QueuePool
+    if url.get_backend_name() == "sqlite":
+        return options
+    options |= {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.db_pool_recycle,
+        # LIFO hands out the most recently used connection, letting idle extras age out
+        "pool_use_lifo": True,
+    }
+    if url.get_backend_name() == "postgresql" and settings.db_statement_timeout_ms:
+        options["connect_args"] = {"server_settings": {"statement_timeout": str(settings.db_statement_timeout_ms)}}
+    return options
+
+
+_async_url = to_async_url(settings.database_url)
+engine = create_async_engine(_async_url, **_engine_options(_async_url))
+# Keep loaded attributes after commit so write endpoints can respond without re-selecting the row
+# (an expired attribute would need a lazy load, which AsyncSession cannot do implicitly)
+session_local = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
 
-def get_db():
-    db = session_local()
-    try:
+async def get_db():
+    async with session_local() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,28 @@
+import asyncio
+import logging
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def run_migrations() -> None:
+    """Upgrade the database to the latest Alembic revision."""
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    # Leave the running application's logging configuration untouched
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+
+
+async def run_migrations_async() -> None:
+    """Run migrations in a worker thread so the app keeps serving while they apply."""
+    try:
+        await asyncio.to_thread(run_migrations)
+        logger.info("Database migrations applied")
+    except Exception:
+        logger.exception("Background database migration failed")
@@ -0,0 +1,149 @@
+import hashlib
+import logging
+import time
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+import orjson
+import redis
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.routing import BaseRoute, Match
+
+from app.core import cache
+from app.core.cache import STALE_TTL
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+_TTL_ATTR = "__response_cache_ttl__"
+
+# Recomputed by Response from the cached body
+_SKIP_HEADERS = frozenset({b"content-length"})
+
+
+def cache_response(ttl: int) -> Callable[[F], F]:
+    """
+    Mark a GET endpoint for ResponseCacheMiddleware; `ttl` is usually a CachePolicy tier.
+    Apply below the router decorator so the marked function is the one registered.
+    """
+
+    def decorator(func: F) -> F:
+        setattr(func, _TTL_ATTR, ttl)
+        return func
+
+    return decorator
+
+
+def _response_key(request: Request) -> Tuple[str, str]:
+    # Callers are told apart by their credentials (Authorization header and cookies), so one
+    # user's body is never served to another; the query is order-insensitive
+    query = sorted(request.query_params.multi_items())
+    credentials = [request.headers.get("authorization", ""), request.headers.get("cookie", "")]
+    digest = hashlib.blake2b(
+        orjson.dumps([credentials, request.url.path, query]),
+        digest_size=16,
+    ).hexdigest()
+    return cache._key("responses", digest), cache._key("stale", f"responses:{digest}")
+
+
+async def _load(key: str, stale: bool = False) -> Optional[Response]:
+    try:
+        entry = await cache.async_redis_client.hgetall(key)
+    except redis.RedisError:
+        logger.warning("Cache read failed for %s", key, exc_info=True)
+        return None
+    if not entry:
+        return None
+    headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in orjson.loads(entry[b"headers"])]
+    # Entries written before stored_at was recorded report an age of 0
+    age = max(0, int(time.time() - float(entry.get(b"stored_at", time.time()))))
+    headers += [(b"x-cache", b"stale" if stale else b"hit"), (b"age", str(age).encode())]
+    return _buffered(entry[b"body"], int(entry[b"status"]), headers)
+
+
+def _buffered(body: bytes, status_code: int, headers: List[Tuple[bytes, bytes]]) -> Response:
+    response = Response(content=body, status_code=status_code)
+    # Raw headers keep repeated names (e.g. set-cookie) that a dict would collapse
+    response.raw_headers = [(name, value) for name, value in headers if name not in _SKIP_HEADERS]
+    response.raw_headers.append((b"content-length", str(len(body)).encode()))
+    return response
+
+
+async def _store(key: str, stale_key: str, response: Response, body: bytes, ttl: int) -> None:
+    entry = {
+        "status": response.status_code,
+        "headers": orjson.dumps(
+            [(name.decode("latin-1"), value.decode("latin-1")) for name, value in response.raw_headers if name not in _SKIP_HEADERS]
+        ),
+        "body": body,
+        "stored_at": time.time(),
+    }
+    try:
+        async with cache.async_redis_client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping=entry)
+            pipe.expire(key, ttl)
+            pipe.hset(stale_key, mapping=entry)
+            pipe.expire(stale_key, STALE_TTL)
+            await pipe.execute()
+    except redis.RedisError:
+        logger.warning("Cache write failed for %s", key, exc_info=True)
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Cache full responses of GET endpoints marked with @cache_response in Redis.
+    A hit skips the endpoint entirely. When the endpoint fails (raises or returns 5xx),
+    the last good response is served for up to STALE_TTL. Cached responses carry
+    `X-Cache: hit` or `X-Cache: stale` and an `Age` header in seconds.
+    """
+
+    def __init__(self, app) -> None:
+        super().__init__(app)
+        self._cached_routes: Optional[List[Tuple[BaseRoute, int]]] = None
+
+    def _route_ttl(self, request: Request) -> Optional[int]:
+        if self._cached_routes is None:
+            self._cached_routes = [
+                (route, getattr(route.endpoint, _TTL_ATTR))
+                for route in request.app.routes
+                if hasattr(getattr(route, "endpoint", None), _TTL_ATTR)
+            ]
+        for route, ttl in self._cached_routes:
+            match, _ = route.matches(request.scope)
+            if match == Match.FULL:
+                return ttl
+        return None
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        if request.method != "GET":
+            return await call_next(request)
+        ttl = self._route_ttl(request)
+        if not ttl:
+            return await call_next(request)
+
+        key, stale_key = _response_key(request)
+        hit = await _load(key)
+        if hit is not None:
+            return hit
+
+        try:
+            response = await call_next(request)
+        except Exception:
+            stale = await _load(stale_key, stale=True)
+            if stale is None:
+                raise
+            logger.warning("Serving stale cached response for %s", request.url.path, exc_info=True)
+            return stale
+
+        if response.status_code >= 500:
+            stale = await _load(stale_key, stale=True)
+            if stale is not None:
+                logger.warning("Serving stale cached response for %s (status %s)", request.url.path, response.status_code)
+                return stale
+        if response.status_code != 200:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        await _store(key, stale_key, response, body, ttl)
+        return _buffered(body, response.status_code, response.raw_headers)
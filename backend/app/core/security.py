@@ -1,6 +1,9 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+from cachetools import TTLCache
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
@@ -8,6 +11,10 @@ from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified JWT payloads keyed by token digest. Clients reuse one bearer token for many
+# requests, so repeat decodes become a dict lookup instead of a signature check.
+_decoded_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -34,3 +41,19 @@ def decode_token(token: str) -> Optional[dict]:
         return payload
     except JWTError:
         return None
+
+
+def decode_token_cached(token: str) -> Optional[dict]:
+    """Like `decode_token`, but reuses a verified payload until the token's own expiry."""
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _decoded_token_cache.get(key)
+    if payload is None:
+        payload = decode_token(token)
+        if payload is None:
+            return None
+        _decoded_token_cache[key] = payload
+    exp = payload.get("exp")
+    if exp is not None and exp < time.time():
+        _decoded_token_cache.pop(key, None)
+        return None
+    return payload
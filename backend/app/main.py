@@ -1,22 +1,54 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api import auth, broker, strategies
+from app.core.config import settings
+from app.core.migrations import run_migrations_async
+from app.core.response_cache import ResponseCacheMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app_: FastAPI):
+    # Synchronous broker SDK calls run on the default executor; size it for concurrent strategies
+    executor = ThreadPoolExecutor(max_workers=settings.broker_thread_pool_size, thread_name_prefix="broker")
+    asyncio.get_running_loop().set_default_executor(executor)
+    eviction_task = asyncio.create_task(broker.close_evicted_adapters())
+    if settings.migration_mode == "async":
+        # Keep a reference so the task isn't garbage collected; /health answers while it runs
+        app_.state.migration_task = asyncio.create_task(run_migrations_async())
+    yield
+    eviction_task.cancel()
+    executor.shutdown(wait=False)
+
 
 app = FastAPI(
     title="Algo Trading System",
     description="Backend API for algorithmic trading",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
-# Configure CORS
+# Innermost: serves GET endpoints marked with @cache_response from Redis
+app.add_middleware(ResponseCacheMiddleware)
+
+# Configure CORS. Credentials can't be combined with a wildcard origin, so they're only
+# allowed when CORS_ORIGINS lists explicit origins.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
+    allow_origins=settings.cors_origins,
+    allow_credentials="*" not in settings.cors_origins,
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Added last so it wraps CORS: compresses JSON bodies (e.g. strategy lists) over 1 KB
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 # Include routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
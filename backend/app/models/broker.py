@@ -8,10 +8,10 @@ class BrokerConnection(Base):
     __tablename__ = "broker_connections"
 
     id = Column(Integer, primary_key=True, index=True)
-    broker_name = Column(String, nullable=False)
+    broker_name = Column(String, nullable=False, index=True)
     api_key = Column(String, nullable=False)
     api_secret = Column(String, nullable=False)
-    is_connected = Column(Boolean, default=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    is_connected = Column(Boolean, default=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -1,6 +1,9 @@
 import enum
+from datetime import datetime
+from typing import Optional
 
-from sqlalchemy import JSON, DateTime, Enum, ForeignKey, Integer, String
+from sqlalchemy import JSON, DateTime, Enum, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -22,13 +25,20 @@ class StrategyStatus(str, enum.Enum):
 
 class Strategy(Base):
     __tablename__ = "strategies"
-
-    id = mapped_column(Integer, primary_key=True, index=True)
-    name = mapped_column(String, nullable=False)
+    __table_args__ = (
+        # Serves "strategies of a user in a given status" without touching the heap rows
+        Index("ix_strategies_user_status", "user_id", "status"),
+        Index("ix_strategies_symbol", "symbol"),
+        # Containment lookups on parameters (`@>`); GIN only exists on Postgres
+        Index("ix_strategies_params_gin", "parameters", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String, nullable=False)
     strategy_type: Mapped[StrategyType] = mapped_column(Enum(StrategyType), nullable=False)
-    symbol = mapped_column(String, nullable=False)
-    parameters: Mapped[dict] = mapped_column(JSON, nullable=False, default={})
-    status: Mapped[StrategyStatus] = mapped_column(Enum(StrategyStatus), default=StrategyStatus.STOPPED)
-    user_id = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at = mapped_column(DateTime(timezone=True), onupdate=func.now())
+    symbol: Mapped[str] = mapped_column(String, nullable=False)
+    parameters: Mapped[dict] = mapped_column(JSON().with_variant(JSONB(), "postgresql"), nullable=False, default=dict)
+    status: Mapped[StrategyStatus] = mapped_column(Enum(StrategyStatus), default=StrategyStatus.STOPPED, index=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), onupdate=func.now())
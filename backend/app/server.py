@@ -0,0 +1,26 @@
+"""
+Production entrypoint: `python -m app.server`.
+Runs Uvicorn on uvloop with the httptools parser and without per-request access logging.
+"""
+
+import os
+
+import uvicorn
+
+
+def main() -> None:
+    uvicorn.run(
+        "app.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        # WEB_CONCURRENCY is Uvicorn's own convention; default to one worker per CPU
+        workers=int(os.getenv("WEB_CONCURRENCY", "0")) or os.cpu_count() or 1,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+        log_level=os.getenv("LOG_LEVEL", "warning"),
+    )
+
+
+if __name__ == "__main__":
+    main()
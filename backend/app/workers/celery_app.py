@@ -16,4 +16,12 @@ celery_app.conf.update(
     enable_utc=True,
     task_track_started=True,
     task_time_limit=3600,  # 1 hour max per task
+    # Broker/DB-bound tasks go to "io", served by a gevent worker running hundreds of tasks
+    # concurrently; CPU-bound work goes to "cpu", served by a small prefork worker.
+    task_default_queue="io",
+    task_routes={
+        "app.workers.tasks.execute_strategy": {"queue": "io"},
+        "app.workers.tasks.send_trade_notification": {"queue": "io"},
+        "app.workers.tasks.process_market_data": {"queue": "cpu"},
+    },
 )
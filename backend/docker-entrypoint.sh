@@ -27,7 +27,12 @@ function wait_for_db() {
 echo "Running docker-entrypoint: run DB migrations then start server"
 wait_for_db
 
-if command -v alembic >/dev/null 2>&1; then
+# MIGRATION_MODE: sync (default) migrates here before start-up, async lets the app
+# migrate in the background after it starts serving, skip leaves migrations to the operator
+MIGRATION_MODE=${MIGRATION_MODE:-sync}
+if [ "$MIGRATION_MODE" != "sync" ]; then
+  echo "MIGRATION_MODE=$MIGRATION_MODE; skipping migrations in entrypoint"
+elif command -v alembic >/dev/null 2>&1; then
   echo "Running alembic upgrade head"
   alembic upgrade head
 else
@@ -35,4 +40,4 @@ else
 fi
 
 echo "Starting uvicorn"
-exec python -m uvicorn app.main:app --host 0.0.0.0 --port ${PORT:-8000} ${UV_ARGS:-}
+exec python -m uvicorn app.main:app --host 0.0.0.0 --port ${PORT:-8000} --loop uvloop --http httptools --no-access-log ${UV_ARGS:-}
@@ -8,6 +8,6 @@ echo "Running migrations via 'migrate' service..."
 docker-compose run --rm migrate
 
 echo "Starting web and celery services..."
-docker-compose up -d web celery
+docker-compose up -d web celery celery-cpu
 
 echo "Dev stack started."
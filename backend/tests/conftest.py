@@ -1,7 +1,60 @@
 import os
 import sys
+from unittest.mock import patch
+
+import pytest
 
 # Ensure the repo root is on sys.path so `import app` works during pytest
 repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if repo_root not in sys.path:
     sys.path.insert(0, repo_root)
+
+
+class FakeAsyncRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    async def incr(self, key):
+        self.store[key] = int(self.store.get(key, 0)) + 1
+        return self.store[key]
+
+    async def hgetall(self, key):
+        return self.store.get(key, {})
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Applies hset/expire immediately; enough for the response cache."""
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def hset(self, key, mapping):
+        self.redis.store[key] = {k.encode(): v if isinstance(v, bytes) else str(v).encode() for k, v in mapping.items()}
+
+    def expire(self, key, ttl):
+        pass
+
+    async def execute(self):
+        return []
+
+
+@pytest.fixture
+def fake_redis():
+    fake = FakeAsyncRedis()
+    with patch("app.core.cache.async_redis_client", fake):
+        yield fake
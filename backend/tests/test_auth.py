@@ -0,0 +1,48 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import auth
+from app.core import security
+from app.core.security import create_access_token, decode_token
+from app.main import app
+
+
+@pytest.fixture
+def client():
+    auth.fake_users_db["cache@example.com"] = {
+        "email": "cache@example.com",
+        "full_name": "Cache User",
+        "hashed_password": "hashed-secret",
+    }
+    security._decoded_token_cache.clear()
+    auth._user_cache.clear()
+    yield TestClient(app)
+    auth.fake_users_db.pop("cache@example.com", None)
+    security._decoded_token_cache.clear()
+    auth._user_cache.clear()
+
+
+def test_me_reuses_decoded_token(client):
+    token = create_access_token({"sub": "cache@example.com"}, expires_delta=timedelta(minutes=5))
+    headers = {"Authorization": f"Bearer {token}"}
+    with patch("app.core.security.decode_token", wraps=decode_token) as decode:
+        for _ in range(3):
+            r = client.get("/api/v1/auth/me", headers=headers)
+            assert r.status_code == 200
+            assert r.json()["email"] == "cache@example.com"
+    assert decode.call_count == 1
+
+
+def test_me_rejects_expired_cached_token(client):
+    token = create_access_token({"sub": "cache@example.com"}, expires_delta=timedelta(minutes=5))
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    # Simulate the token expiring while its payload is still cached
+    for payload in security._decoded_token_cache.values():
+        payload["exp"] = 0
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 401
+    assert len(security._decoded_token_cache) == 0
@@ -0,0 +1,256 @@
+import asyncio
+from email.message import Message
+
+import pyotp
+import pytest
+import requests
+from fastapi.testclient import TestClient
+from fyers_apiv3 import fyersModel
+from requests.cookies import MockRequest, MockResponse
+
+from app.api import broker as broker_api
+from app.brokers import AngelOneBroker, BrokerAdapter, DhanBroker, FyersBroker, angel_one, fyers, get_broker_adapter
+from app.main import app
+
+
+@pytest.mark.parametrize(
+    "broker_name, expected",
+    [("dhan", DhanBroker), ("AngelOne", AngelOneBroker), ("FYERS", FyersBroker)],
+)
+def test_get_broker_adapter_is_case_insensitive(broker_name, expected):
+    assert isinstance(get_broker_adapter(broker_name), expected)
+
+
+def test_get_broker_adapter_rejects_unknown_broker():
+    with pytest.raises(ValueError, match="Unsupported broker: zerodha"):
+        get_broker_adapter("zerodha")
+
+
+def test_supported_brokers_match_the_adapter_registry():
+    r = TestClient(app).get("/api/v1/broker/supported")
+    assert r.status_code == 200
+    supported = r.json()
+    assert sorted(supported) == ["angelone", "dhan", "fyers"]
+    for broker_name in supported:
+        assert get_broker_adapter(broker_name).broker_name == broker_name
+
+
+class FakeBroker(BrokerAdapter):
+    broker_name = "fake"
+
+    def __init__(self):
+        self.credentials = None
+        self.closed = False
+
+    async def connect(self, credentials):
+        await asyncio.sleep(0)
+        if credentials.get("access_token") == "unreachable":
+            raise ConnectionError("broker unreachable")
+        self.credentials = credentials
+        return credentials.get("access_token") != "bad"
+
+    async def aclose(self):
+        await asyncio.sleep(0)
+        self.closed = True
+
+    async def get_profile(self):
+        return {}
+
+    async def place_order(self, order_details):
+        return {}
+
+    async def cancel_order(self, order_id):
+        return True
+
+    async def get_order_status(self, order_id):
+        return {}
+
+    async def get_positions(self):
+        if self.credentials.get("access_token") == "expired":
+            raise ConnectionError("broker unreachable")
+        return [{"symbol": "SBIN"}]
+
+    async def get_holdings(self):
+        return [{"symbol": "INFY"}]
+
+
+@pytest.fixture
+def broker_client(monkeypatch, fake_redis):
+    created = []
+
+    def fake_factory(broker_name):
+        adapter = FakeBroker()
+        created.append(adapter)
+        return adapter
+
+    monkeypatch.setattr(broker_api, "get_broker_adapter", fake_factory)
+    broker_api.broker_connections.clear()
+    yield TestClient(app), created
+    broker_api.broker_connections.clear()
+
+
+def _connect(client, user_id, access_token="token"):
+    payload = {"broker_name": "fake", "api_key": "k", "api_secret": "s", "user_id": user_id, "client_id": "c1", "access_token": access_token}
+    return client.post("/api/v1/broker/connect", json=payload)
+
+
+def test_connect_pools_adapter_per_user(broker_client):
+    client, created = broker_client
+    assert _connect(client, "u1").status_code == 200
+    assert created[0].credentials["client_id"] == "c1"
+    assert client.get("/api/v1/broker/status/u1").json()["status"] == "connected"
+
+    # Reconnecting replaces and closes the previous adapter
+    assert _connect(client, "u1").status_code == 200
+    assert created[0].closed and not created[1].closed
+    assert broker_api.broker_connections["u1"] is created[1]
+
+    r = client.delete("/api/v1/broker/disconnect/u1")
+    assert r.json()["broker_name"] == "fake"
+    assert created[1].closed
+    assert client.get("/api/v1/broker/status/u1").json()["status"] == "not_connected"
+
+
+def test_portfolio_combines_positions_and_holdings(broker_client):
+    client, _ = broker_client
+    assert client.get("/api/v1/broker/portfolio/u1").status_code == 404
+    assert _connect(client, "u1").status_code == 200
+    r = client.get("/api/v1/broker/portfolio/u1")
+    assert r.status_code == 200
+    assert r.json() == {"broker_name": "fake", "positions": [{"symbol": "SBIN"}], "holdings": [{"symbol": "INFY"}]}
+
+
+def test_portfolio_responses_are_cached_with_stale_fallback(broker_client, fake_redis):
+    client, created = broker_client
+    _connect(client, "u1")
+    assert client.get("/api/v1/broker/portfolio/u1").status_code == 200
+    fresh_keys = [k for k in fake_redis.store if k.startswith("algo:responses:")]
+    assert len(fresh_keys) == 1
+
+    # While fresh, the endpoint isn't called: the cached body wins over a broken adapter
+    created[0].credentials["access_token"] = "expired"
+    r = client.get("/api/v1/broker/portfolio/u1")
+    assert r.status_code == 200 and r.json()["positions"] == [{"symbol": "SBIN"}]
+    assert r.headers["x-cache"] == "hit"
+
+    # TTL elapsed and the broker fails: the last good response is served
+    fake_redis.store.pop(fresh_keys[0])
+    stale_client = TestClient(app, raise_server_exceptions=False)
+    r = stale_client.get("/api/v1/broker/portfolio/u1")
+    assert r.status_code == 200 and r.json()["holdings"] == [{"symbol": "INFY"}]
+    assert r.headers["content-type"] == "application/json"
+    assert r.headers["x-cache"] == "stale" and int(r.headers["age"]) >= 0
+
+
+def test_connect_rejects_bad_credentials(broker_client):
+    client, created = broker_client
+    assert _connect(client, "u1", access_token="bad").status_code == 401
+    assert created[0].closed
+    assert "u1" not in broker_api.broker_connections
+
+
+def test_connect_maps_broker_errors_to_bad_gateway(broker_client):
+    client, created = broker_client
+    assert _connect(client, "u1", access_token="unreachable").status_code == 502
+    assert created[0].closed
+    assert "u1" not in broker_api.broker_connections
+
+
+def test_concurrent_connects_close_every_replaced_adapter(broker_client):
+    _, created = broker_client
+    config = broker_api.BrokerConfig(broker_name="fake", api_key="k", api_secret="s", user_id="u1", access_token="t")
+
+    async def scenario():
+        await asyncio.gather(*(broker_api.connect_broker(config) for _ in range(3)))
+
+    asyncio.run(scenario())
+    live = broker_api.broker_connections["u1"]
+    assert not live.closed
+    assert all(adapter.closed for adapter in created if adapter is not live)
+
+
+def test_pool_closes_least_recently_used_adapter():
+    async def scenario():
+        consumer = asyncio.create_task(broker_api.close_evicted_adapters())
+        await asyncio.sleep(0)
+        pool = broker_api.AdapterPool(maxsize=2)
+        adapters = {user_id: FakeBroker() for user_id in ("u1", "u2", "u3")}
+        pool["u1"] = adapters["u1"]
+        pool["u2"] = adapters["u2"]
+        pool.get("u1")  # u2 becomes the least recently used entry
+        pool["u3"] = adapters["u3"]
+        await broker_api._evicted_adapters.join()
+        consumer.cancel()
+        return pool, adapters
+
+    pool, adapters = asyncio.run(scenario())
+    assert sorted(pool) == ["u1", "u3"]
+    assert adapters["u2"].closed
+    assert not adapters["u1"].closed and not adapters["u3"].closed
+
+
+def test_pool_eviction_outside_event_loop_keeps_new_adapter():
+    pool = broker_api.AdapterPool(maxsize=1)
+    first, second = FakeBroker(), FakeBroker()
+    pool["u1"] = first
+    pool["u2"] = second
+    assert list(pool) == ["u2"] and pool["u2"] is second
+    assert first.closed and not second.closed
+
+
+def test_fyers_sdk_requests_use_the_calling_adapters_session():
+    first, second = FyersBroker(), FyersBroker()
+
+    async def scenario():
+        return await first._call(fyersModel.requests._target), await second._call(fyersModel.requests._target)
+
+    assert asyncio.run(scenario()) == (first._http, second._http)
+    # Outside an adapter call the SDK falls back to the real module
+    assert fyersModel.requests._target() is requests
+    assert fyersModel.requests.HTTPError is requests.HTTPError
+
+    # A Set-Cookie from one call is never stored, so it can't be replayed on later calls
+    headers = Message()
+    headers["Set-Cookie"] = "sid=abc; Path=/"
+    request = requests.Request("GET", "https://api-t1.fyers.in/api/v3/profile").prepare()
+    first._http.cookies.extract_cookies(MockResponse(headers), MockRequest(request))
+    assert len(first._http.cookies) == 0
+
+    asyncio.run(first.aclose())
+    asyncio.run(second.aclose())
+
+
+def test_place_orders_runs_concurrently_within_limit():
+    class SlowBroker(FakeBroker):
+        max_concurrent_orders = 3
+
+        def __init__(self):
+            super().__init__()
+            self.in_flight = 0
+            self.peak = 0
+
+        async def place_order(self, order_details):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            if order_details["symbol"] == "BAD":
+                raise RuntimeError("rejected")
+            return {"order_id": order_details["symbol"]}
+
+    broker = SlowBroker()
+    orders = [{"symbol": f"S{i}"} for i in range(8)] + [{"symbol": "BAD"}]
+    results = asyncio.run(broker.place_orders(orders))
+
+    assert broker.peak == 3
+    assert results[:8] == [{"order_id": f"S{i}"} for i in range(8)]
+    assert isinstance(results[8], RuntimeError)
+
+
+def test_totp_cache_is_keyed_by_a_hash_of_the_seed():
+    seed = pyotp.random_base32()
+    code = angel_one._current_totp(seed)
+    assert code == pyotp.TOTP(seed).now()
+    assert angel_one._current_totp(seed) == code
+    assert seed not in angel_one._totp_cache
+    assert angel_one._totp_cache.maxsize == 10_000
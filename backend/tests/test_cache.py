@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from app.brokers import FyersBroker
+
+
+class FakeFyersModel:
+    def __init__(self):
+        self.positions_calls = 0
+        self.fail = False
+
+    def positions(self):
+        self.positions_calls += 1
+        if self.fail:
+            raise ConnectionError("broker unreachable")
+        return {"s": "ok", "netPositions": [{"symbol": "NSE:SBIN-EQ", "qty": self.positions_calls}]}
+
+
+def _broker(client_id="C1"):
+    broker = FyersBroker()
+    broker.client_id = client_id
+    broker.fyers = FakeFyersModel()
+    return broker
+
+
+def test_positions_are_cached_per_account(fake_redis):
+    broker, other = _broker("C1"), _broker("C2")
+
+    async def scenario():
+        first = await broker.get_positions()
+        second = await broker.get_positions()
+        third = await other.get_positions()
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert first == second == [{"symbol": "NSE:SBIN-EQ", "qty": 1}]
+    assert broker.fyers.positions_calls == 1
+    assert other.fyers.positions_calls == 1 and third == first
+    assert "algo:calls:fyers:C1:get_positions" in fake_redis.store
+
+
+def test_concurrent_misses_share_one_broker_call(fake_redis):
+    broker = _broker()
+
+    async def scenario():
+        return await asyncio.gather(*(broker.get_positions() for _ in range(10)))
+
+    results = asyncio.run(scenario())
+    assert broker.fyers.positions_calls == 1
+    assert all(result == results[0] for result in results)
+
+
+def test_stale_value_served_when_broker_fails(fake_redis):
+    broker = _broker()
+
+    async def scenario():
+        fresh = await broker.get_positions()
+        fake_redis.store.pop("algo:calls:fyers:C1:get_positions")  # TTL elapsed
+        broker.fyers.fail = True
+        return fresh, await broker.get_positions()
+
+    fresh, stale = asyncio.run(scenario())
+    assert stale == fresh
+    assert broker.fyers.positions_calls == 2
+
+
+def test_failure_without_stale_value_propagates(fake_redis):
+    broker = _broker()
+    broker.fyers.fail = True
+    with pytest.raises(ConnectionError):
+        asyncio.run(broker.get_positions())
+
+
+def test_concurrent_order_status_polls_share_one_orderbook_call(fake_redis):
+    broker = _broker()
+    calls = []
+
+    def orderbook():
+        calls.append(1)
+        return {"s": "ok", "orderBook": [{"id": "A1", "status": 2}, {"id": "B2", "status": 6}]}
+
+    broker.fyers.orderbook = orderbook
+
+    async def scenario():
+        return await asyncio.gather(*(broker.get_order_status(order_id) for order_id in ["A1", "B2", "missing"] * 10))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert results[:3] == [{"id": "A1", "status": 2}, {"id": "B2", "status": 6}, {}]
+
+
+def test_order_status_errors_are_not_masked_by_stale_orderbook(fake_redis):
+    broker = _broker()
+    broker.fyers.orderbook = lambda: {"s": "ok", "orderBook": [{"id": "A1", "status": 6}]}
+    assert asyncio.run(broker.get_order_status("A1")) == {"id": "A1", "status": 6}
+    assert not [key for key in fake_redis.store if key.startswith("algo:stale:")]
+    fake_redis.store.pop("algo:calls:fyers:C1:_fetch_orderbook_indexed")  # TTL elapsed
+
+    def orderbook():
+        raise ConnectionError("broker unreachable")
+
+    broker.fyers.orderbook = orderbook
+    with pytest.raises(ConnectionError):
+        asyncio.run(broker.get_order_status("A1"))
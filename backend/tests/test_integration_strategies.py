@@ -1,83 +1,125 @@
-import json
+import os
 from typing import Generator
 
 import pytest
 from unittest.mock import patch
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-import tempfile
-import os
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 
-from app.core.database import Base, get_db
+from app.api import strategies
+from app.core.database import Base, get_db, to_async_url
 from app.main import app
-from app.models.strategy import Strategy as StrategyModel
+from app.models.strategy import Strategy as StrategyModel, StrategyStatus, StrategyType
 from app.models.user import User as UserModel
 
 
 @pytest.fixture(scope="session")
-def engine(tmp_path_factory):
-    # If DATABASE_URL env var is set, use that (for dockerized integration tests), otherwise a temporary sqlite file
-    import os
-
+def engine():
+    # If DATABASE_URL env var is set, use that (for dockerized integration tests), otherwise an in-memory sqlite
+    # database; StaticPool hands every session the same connection, which `:memory:` needs to keep its tables.
     db_url = os.getenv("DATABASE_URL")
     if db_url:
-        engine = create_engine(db_url, future=True)
-        return engine
-    tmp_dir = tmp_path_factory.mktemp("db")
-    db_file = tmp_dir / "test_db.sqlite"
-    url = f"sqlite:///{db_file}"
-    engine = create_engine(url, connect_args={"check_same_thread": False})
+        return create_async_engine(to_async_url(db_url))
+    engine = create_async_engine("sqlite+aiosqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _configure_connection(dbapi_connection, _):
+        # pysqlite defers BEGIN on its own, which breaks SAVEPOINTs; let SQLAlchemy emit it instead
+        dbapi_connection.isolation_level = None
+        # No fsync per commit and temp B-trees in RAM (WAL does not apply to :memory: databases)
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     return engine
 
 
 @pytest.fixture(scope="session")
-def db_session(engine) -> Generator:
-    """Create a temporary in-memory DB and return a session factory"""
-    Base.metadata.create_all(bind=engine)
-    SessionLocal = sessionmaker(bind=engine)
-    yield SessionLocal
-    Base.metadata.drop_all(bind=engine)
+def app_client() -> Generator:
+    # One client (and so one event loop) for the whole session; the DB connection is bound to that loop
+    with TestClient(app) as client:
+        yield client
+
+
+async def _run_ddl(engine, ddl) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(ddl)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema(engine, app_client) -> Generator:
+    app_client.portal.call(_run_ddl, engine, Base.metadata.create_all)
+    yield
+    app_client.portal.call(_run_ddl, engine, Base.metadata.drop_all)
 
 
 @pytest.fixture
-def client(db_session):
-    def override_get_db():
-        db = db_session()
-        try:
+def db_session(engine, app_client) -> Generator:
+    """Session factory on one connection; each commit is a SAVEPOINT and the whole test is rolled back"""
+
+    async def begin():
+        conn = await engine.connect()
+        return conn, await conn.begin()
+
+    async def rollback(conn, trans):
+        await trans.rollback()
+        await conn.close()
+
+    conn, trans = app_client.portal.call(begin)
+    yield async_sessionmaker(bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint")
+    app_client.portal.call(rollback, conn, trans)
+
+
+@pytest.fixture
+def client(app_client, db_session, fake_redis):
+    async def override_get_db():
+        async with db_session() as db:
             yield db
-        finally:
-            db.close()
 
+    # Rolled-back ids are handed out again, so snapshots from earlier tests must not survive
+    strategies._strategy_cache.clear()
     app.dependency_overrides[get_db] = override_get_db
-    client = TestClient(app)
-    yield client
+    yield app_client
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def user_id(app_client, db_session) -> int:
+    """Owner for the test's strategies, inserted inside its transaction so the foreign key holds on Postgres"""
+
+    async def add_user():
+        async with db_session() as db:
+            user = UserModel(email="utest@example.com", hashed_password="hashed-secret", full_name="UTest")
+            db.add(user)
+            await db.commit()
+            return user.id
+
+    return app_client.portal.call(add_user)
+
+
 @pytest.mark.integration
-def test_create_and_list_strategy(client, db_session):
-    # create a user API level (in-memory) AND create DB-level user
+def test_create_and_list_strategy(client, user_id):
+    # create a user at the API level (in-memory); the DB-level user comes from the user_id fixture
     payload = {"email": "utest@example.com", "password": "secret", "full_name": "UTest"}
     # patch get_password_hash in auth module to avoid passlib/bcrypt issues in tests
     with patch("app.api.auth.get_password_hash", side_effect=lambda p: f"hashed-{p}"):
         r = client.post("/api/v1/auth/register", json=payload)
     assert r.status_code == 200
 
-    # Insert a DB user directly so Strategy.user_id=1 exists in the DB for constraints
-    db = db_session()
-    user = UserModel(email="utest@example.com", hashed_password="hashed-secret", full_name="UTest")
-    db.add(user)
-    db.commit()
-    db.close()
-
     # Create strategy
     create_payload = {
         "name": "test-strategy",
         "strategy_type": "momentum",
         "symbol": "SBIN",
         "parameters": {"lookback": 10},
-        "user_id": 1,
+        "user_id": user_id,
     }
     r = client.post("/api/v1/strategies/", json=create_payload)
     assert r.status_code == 200
@@ -89,3 +131,106 @@ def test_create_and_list_strategy(client, db_session):
     assert r.status_code == 200
     items = r.json()
     assert isinstance(items, list) and len(items) == 1
+
+
+@pytest.mark.integration
+def test_get_strategy_reflects_status_changes(client, user_id):
+    create_payload = {
+        "name": "cached-strategy",
+        "strategy_type": "breakout",
+        "symbol": "INFY",
+        "parameters": {},
+        "user_id": user_id,
+    }
+    r = client.post("/api/v1/strategies/", json=create_payload)
+    assert r.status_code == 200
+    strategy_id = r.json()["id"]
+
+    # Prime the per-strategy cache, then make sure writes invalidate it
+    assert client.get(f"/api/v1/strategies/{strategy_id}").json()["status"] == "stopped"
+    assert client.post(f"/api/v1/strategies/{strategy_id}/start").status_code == 200
+    assert client.get(f"/api/v1/strategies/{strategy_id}").json()["status"] == "active"
+
+    assert client.delete(f"/api/v1/strategies/{strategy_id}").status_code == 200
+    assert client.get(f"/api/v1/strategies/{strategy_id}").status_code == 404
+
+
+@pytest.mark.integration
+def test_list_strategies_is_paginated(client, user_id):
+    for i in range(3):
+        payload = {"name": f"page-{i}", "strategy_type": "scalping", "symbol": "TCS", "parameters": {}, "user_id": user_id}
+        r = client.post("/api/v1/strategies/", json=payload)
+        assert r.status_code == 200
+
+    r = client.get("/api/v1/strategies/", params={"user_id": user_id, "limit": 2})
+    assert r.status_code == 200
+    first_page = [s["id"] for s in r.json()]
+    assert len(first_page) == 2
+
+    r = client.get("/api/v1/strategies/", params={"user_id": user_id, "skip": 2, "limit": 2})
+    second_page = [s["id"] for s in r.json()]
+    assert not set(first_page) & set(second_page)
+    assert client.get("/api/v1/strategies/", params={"limit": 0}).status_code == 422
+
+
+@pytest.mark.integration
+def test_strategy_summary_lists_only_list_view_fields(client, user_id):
+    payload = {"name": "summary", "strategy_type": "breakout", "symbol": "WIPRO", "parameters": {"k": 1}, "user_id": user_id}
+    strategy_id = client.post("/api/v1/strategies/", json=payload).json()["id"]
+
+    r = client.get("/api/v1/strategies/summary", params={"user_id": user_id})
+    assert r.status_code == 200
+    assert {"id": strategy_id, "name": "summary", "status": "stopped"} in r.json()
+
+
+@pytest.mark.integration
+def test_update_strategy_returns_enum_values(client, user_id):
+    payload = {"name": "to-update", "strategy_type": "mean_reversion", "symbol": "HDFC", "parameters": {"window": 5}, "user_id": user_id}
+    strategy_id = client.post("/api/v1/strategies/", json=payload).json()["id"]
+
+    r = client.patch(f"/api/v1/strategies/{strategy_id}", json={"status": "paused", "parameters": {"window": 7}})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["status"] == "paused"
+    assert body["strategy_type"] == "mean_reversion"
+    assert body["parameters"] == {"window": 7}
+
+    assert client.patch(f"/api/v1/strategies/{strategy_id}", json={"status": "bogus"}).status_code == 422
+
+
+@pytest.mark.integration
+def test_strategy_response_round_trips_its_own_dump():
+    resp = strategies.StrategyResponse(
+        id=1,
+        name="rt",
+        strategy_type=StrategyType.MOMENTUM,
+        symbol="INFY",
+        parameters={},
+        status=StrategyStatus.ACTIVE,
+        user_id=1,
+    )
+    assert strategies.StrategyResponse.model_validate(resp.model_dump()) == resp
+    assert resp.model_dump(mode="json")["status"] == "active"
+
+
+@pytest.mark.integration
+def test_list_strategies_served_from_cache_until_write(client, fake_redis, user_id):
+    first = client.get("/api/v1/strategies/", params={"user_id": user_id})
+    assert first.status_code == 200
+    assert f"algo:strategies:0:{user_id}:0:100" in fake_redis.store
+
+    # A hit returns the cached bytes verbatim
+    fake_redis.store[f"algo:strategies:0:{user_id}:0:100"] = b"[]"
+    assert client.get("/api/v1/strategies/", params={"user_id": user_id}).json() == []
+
+    # Writes start a new generation, so pages cached under the old one are never read again
+    payload = {"name": "invalidate", "strategy_type": "momentum", "symbol": "ITC", "parameters": {}, "user_id": user_id}
+    strategy_id = client.post("/api/v1/strategies/", json=payload).json()["id"]
+    assert fake_redis.store["algo:strategies:gen"] == 1
+    names = [s["name"] for s in client.get("/api/v1/strategies/", params={"user_id": user_id}).json()]
+    assert "invalidate" in names
+    assert f"algo:strategies:1:{user_id}:0:100" in fake_redis.store
+
+    assert client.delete(f"/api/v1/strategies/{strategy_id}").status_code == 200
+    assert fake_redis.store["algo:strategies:gen"] == 2
+    assert client.get("/api/v1/strategies/", params={"user_id": user_id}).json() == []